@@ -2,29 +2,124 @@
 # Copyright (c) 2025 Kollin Brown
 # Licensed under the MIT License. See the LICENSE file in the project root for details.
 
+import hashlib
+import json
+import logging
+import os
 import random
 import threading
-import matplotlib
+import time
+from collections import deque
+from typing import Optional, Tuple
 
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 try:
     from qiskit_ibm_runtime import QiskitRuntimeService, SamplerV2 as Sampler
     from qiskit import QuantumCircuit, transpile
-    from qiskit.visualization import plot_histogram
+    from qiskit.circuit import Parameter
 except ImportError:
     QiskitRuntimeService = None
     Sampler = None
     QuantumCircuit = None
     transpile = None
-    plot_histogram = None
+    Parameter = None
+
+try:
+    from qiskit import qpy, __version__ as qiskit_version
+except ImportError:
+    qpy = None
+    qiskit_version = None
 
 try:
     from qiskit_aer import Aer
 except ImportError:
     Aer = None
 
+logger = logging.getLogger(__name__)
+
+# Bit weights for packing 8 bits per byte, most significant first (np.packbits order).
+_PACK_WEIGHTS = np.array([128, 64, 32, 16, 8, 4, 2, 1], dtype=np.uint8) if np is not None else None
+
+# How often the producer thread checks on in-flight hardware jobs.
+HARDWARE_POLL_INTERVAL = 0.5
+
+
+def _build_base_circuits():
+    """
+    Build the sampling circuits once per process. The plain coin is a single
+    H + measure. Chaos mode uses a two-qubit entangling circuit with random
+    single-qubit rotations to introduce extra interference while still
+    collapsing to a single bit via parity; its angles are left as parameters
+    so the circuit is built and transpiled once and only rebound per job.
+    """
+    base = QuantumCircuit(1)
+    base.h(0)
+    base.measure_all()
+
+    theta = Parameter("theta")
+    phi = Parameter("phi")
+    chaos = QuantumCircuit(2)
+    chaos.h(0)
+    chaos.cx(0, 1)
+    chaos.ry(theta, 0)
+    chaos.rz(phi, 1)
+    chaos.h([0, 1])
+    chaos.measure_all()
+    return base, chaos
+
+
+if QuantumCircuit is not None:
+    _BASE_CIRCUIT, _CHAOS_CIRCUIT = _build_base_circuits()
+else:
+    _BASE_CIRCUIT = _CHAOS_CIRCUIT = None
+
+
+def _save_histogram_png(counts, path: str = "Q-histogram.png") -> bool:
+    """
+    Plot counts to a PNG. matplotlib is imported here rather than at module
+    load so games that never plot don't pay its import cost. Returns False
+    if matplotlib/Qiskit plotting is unavailable or the plot can't be saved.
+    """
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from qiskit.visualization import plot_histogram
+    except ImportError:
+        logger.warning("[QuantumCoin] matplotlib not available; writing counts as JSON instead.")
+        return False
+
+    try:
+        fig = plot_histogram(counts)
+        try:
+            fig.savefig(path)
+        finally:
+            plt.close(fig)
+    except Exception as exc:
+        logger.warning("[QuantumCoin] Could not save histogram to %s: %s", path, exc)
+        return False
+    logger.info("[QuantumCoin] Saved histogram to %s", path)
+    return True
+
+
+def _save_histogram_json(counts, path: str = "Q-histogram.json"):
+    """
+    Write the raw counts dict as JSON; no plotting dependencies needed.
+    A failed write is logged and ignored, since sampling doesn't depend on it.
+    """
+    try:
+        with open(path, "w") as fh:
+            json.dump(counts, fh)
+    except (OSError, TypeError, ValueError) as exc:
+        logger.warning("[QuantumCoin] Could not save counts to %s: %s", path, exc)
+        return
+    logger.info("[QuantumCoin] Saved counts to %s", path)
+
 
 class QuantumCoin:
     """
@@ -39,52 +134,82 @@ class QuantumCoin:
         self,
         backend_name: str = "ibm_torino",
         aer_backend_name: str = "aer_simulator",
-        shots: int = 256,
+        shots: int = 8192,
         hardware_timeout: float = 15.0,
+        hardware_cooldown: float = 60.0,
         prefill_async: bool = True,
+        prefetch_depth: int = 2,
+        n_transpile_passes: int = 5,
+        hardware_batch: int = 1,
+        transpile_cache_dir: Optional[str] = None,
         save_histogram: bool = True,
+        histogram_format: str = "png",
         force_aer: bool = False,
         chaos_mode: bool = False,
+        verbose: bool = False,
         **kwargs,
     ):
         if "use_real_hardware" in kwargs:
             _ = kwargs["use_real_hardware"]
 
+        logger.setLevel(logging.DEBUG if verbose else logging.WARNING)
+
         self.use_hardware = (not force_aer) and (QiskitRuntimeService is not None)
         self.use_aer = (Aer is not None) and (QuantumCircuit is not None)
         self.backend_name = backend_name
         self.aer_backend_name = aer_backend_name
         self.shots = shots
         self.hardware_timeout = hardware_timeout
+        self.hardware_cooldown = hardware_cooldown
         self.prefill_async = prefill_async
+        self.prefetch_depth = max(1, prefetch_depth)
+        self.n_transpile_passes = max(1, n_transpile_passes)
+        self.hardware_batch = max(1, hardware_batch)
+        self.transpile_cache_dir = transpile_cache_dir or os.path.join(
+            os.path.expanduser("~"), ".cache", "quantumttt"
+        )
         self.save_histogram = save_histogram
+        self.histogram_format = histogram_format
         self.force_aer = force_aer
         self.chaos_mode = chaos_mode
+        self.verbose = verbose
 
         self.service = None
         self.backend = None
         self.sampler = None
         self.aer_backend = None
 
-        self._buffer = []
+        self._rng = np.random.default_rng() if np is not None else None
+        self._buffer = b""
+        self._buffer_width = 1
+        self._buffer_len = 0
         self._buffer_index = 0
-        self._fetching = False
+        self._ready = deque()
+        self._pool = deque()
+        self._samples = ()
+        self._bits = ()
+        self._histogram_saved = False
+        self._hw_cooldown_until = 0.0
+        self._fallback_bits = 0
+        self._fallback_count = 0
+        self._refill_sem = threading.Semaphore(0)
+        self._retry = threading.Event()
+        self._producer = None
+        self._closed = False
 
         if QiskitRuntimeService is None:
-            print("[QuantumCoin] qiskit-ibm-runtime not installed; hardware disabled.")
+            logger.warning("[QuantumCoin] qiskit-ibm-runtime not installed; hardware disabled.")
         if Aer is None:
-            print("[QuantumCoin] qiskit-aer not installed; simulator fallback unavailable.")
-        if matplotlib is None or plt is None:
-            print("[QuantumCoin] matplotlib not available; histograms disabled.")
+            logger.warning("[QuantumCoin] qiskit-aer not installed; simulator fallback unavailable.")
 
         if self.use_hardware:
             try:
                 self.service = QiskitRuntimeService()
                 self.backend = self.service.backend(self.backend_name)
                 self.sampler = Sampler(self.backend)
-                print(f"[QuantumCoin] Using hardware backend: {self.backend.name}")
+                logger.info("[QuantumCoin] Using hardware backend: %s", self.backend.name)
             except Exception as exc:
-                print(f"[QuantumCoin] Hardware init failed, will fall back to Aer: {exc}")
+                logger.warning("[QuantumCoin] Hardware init failed, will fall back to Aer: %s", exc)
                 self.use_hardware = False
 
         if self.use_aer:
@@ -92,163 +217,514 @@ class QuantumCoin:
                 self.aer_backend = Aer.get_backend(self.aer_backend_name)
                 if not self.use_hardware:
                     self.backend = self.aer_backend
-                print(f"[QuantumCoin] Aer simulator available: {self.aer_backend.name}")
+                logger.info("[QuantumCoin] Aer simulator available: %s", self.aer_backend.name)
             except Exception as exc:
-                print(f"[QuantumCoin] Aer init failed, will rely on hardware/classical: {exc}")
+                logger.warning("[QuantumCoin] Aer init failed, will rely on hardware/classical: %s", exc)
                 self.use_aer = False
 
         if not self.use_hardware and not self.use_aer:
-            print("[QuantumCoin] Using classical random bit (no quantum backend available).")
+            logger.warning("[QuantumCoin] Using classical random bit (no quantum backend available).")
+
+        self._circuit = None
+        self._qc_t_hw = None
+        self._qc_t_aer = None
+        self._transpile_lock = threading.Lock()
 
         if self.use_hardware or self.use_aer:
-            if self.prefill_async:
-                self._maybe_refill_async()
+            self._circuit = self._build_circuit()
+            self._buffer_width = self._circuit.num_clbits
+            logger.debug("[QuantumCoin] Original circuit:\n%s", self._circuit)
+
+        if (self.use_hardware or self.use_aer) and np is not None:
+            # Preallocate the producer's scratch space and enough packed
+            # buffers for the ready queue plus the active one; drained buffers
+            # are returned to the pool instead of being reallocated.
+            max_samples = self.shots * max(self.hardware_batch, 1)
+            self._alloc_scratch(max_samples)
+            pool_bytes = (max_samples * self._buffer_width + 7) >> 3
+            for _ in range(self.prefetch_depth + 1):
+                self._pool.append(np.empty(pool_bytes, dtype=np.uint8))
+
+        if self.use_hardware or self.use_aer:
+            slots = self.prefetch_depth
+            if not self.prefill_async:
+                buf = self._produce_buffer()
+                if buf is not None:
+                    self._publish(buf)
+                    slots -= 1
+            for _ in range(slots):
+                self._request_refill()
+            self._producer = threading.Thread(target=self._producer_loop, daemon=True)
+            self._producer.start()
+
+    def _produce_buffer(self):
+        """
+        Synchronously produce one buffer: try hardware (waiting up to
+        `hardware_timeout`), then Aer. Returns (packed bits, outcome count)
+        or None if no quantum backend produced counts.
+        """
+        # Right Here Casper!!
+        if self._hardware_ready():
+            job = None
+            try:
+                job = self._submit_hardware()
+                counts = self._reap_hardware(job, timeout=self.hardware_timeout)
+                return self._buffer_from_counts(counts)
+            except Exception as exc:
+                logger.warning("[QuantumCoin] Hardware sampling failed, trying Aer: %s", exc)
+                if job is not None:
+                    self._cancel_hardware(job)
+                self._start_hardware_cooldown()
+        return self._produce_aer_buffer()
+
+    def _hardware_ready(self) -> bool:
+        """True if hardware is configured and not cooling down after a failure."""
+        return (
+            self.use_hardware
+            and self.sampler is not None
+            and time.monotonic() >= self._hw_cooldown_until
+        )
+
+    def _start_hardware_cooldown(self):
+        """
+        Skip hardware for `hardware_cooldown` seconds after a failure or
+        timeout, so a degraded backend doesn't cost a full timeout on every
+        refill while Aer can serve them immediately.
+        """
+        self._hw_cooldown_until = time.monotonic() + self.hardware_cooldown
+        logger.warning("[QuantumCoin] Using Aer only for the next %d s.", self.hardware_cooldown)
+
+    def _produce_aer_buffer(self):
+        """Sample on Aer and return a buffer, or None if Aer is unavailable or fails."""
+        if self.use_aer and self.aer_backend is not None:
+            try:
+                qc_aer = self._bind_circuit(self._aer_circuit())
+                return self._buffer_from_counts(self._run_aer_counts(qc_aer))
+            except Exception as exc:
+                logger.warning("[QuantumCoin] Aer sampling failed, falling back to classical: %s", exc)
+        logger.warning("[QuantumCoin] No quantum counts available, using classical fallback.")
+        return None
+
+    def _buffer_from_counts(self, counts):
+        """
+        Turn measurement counts into a shuffled sequence of outcomes and
+        return them as (packed bits, outcome count) with `_buffer_width` bits
+        per outcome. Uses NumPy when installed, the stdlib otherwise.
+        """
+        if self.save_histogram and not self._histogram_saved:
+            self._histogram_saved = True
+            if self.histogram_format == "json" or not _save_histogram_png(counts):
+                _save_histogram_json(counts)
+
+        if np is None:
+            return self._pack_counts_stdlib(counts)
+        return self._pack_counts_numpy(counts)
+
+    def _pack_counts_numpy(self, counts):
+        """Exact-count shuffle and bit packing into pooled arrays, all in NumPy."""
+        width = self._buffer_width
+        n = sum(counts.values())
+        n_bits = n * width
+        n_bytes = (n_bits + 7) >> 3
+        if len(self._samples) < n or len(self._bits) < n_bytes * 8:
+            self._alloc_scratch(n)
+
+        samples = self._samples[:n]
+        start = 0
+        for bit_str, cnt in counts.items():
+            samples[start:start + cnt] = int(bit_str, 2)
+            start += cnt
+        self._rng.shuffle(samples)
+
+        bits = self._bits[:n_bytes * 8]
+        per_sample = bits[:n_bits].reshape(n, width)
+        for j in range(width):
+            np.right_shift(samples, width - 1 - j, out=per_sample[:, j])
+        np.bitwise_and(bits[:n_bits], 1, out=bits[:n_bits])
+        bits[n_bits:] = 0
+
+        packed = self._take_pool_buffer(n_bytes)
+        np.dot(bits.reshape(n_bytes, 8), _PACK_WEIGHTS, out=packed[:n_bytes])
+
+        logger.debug("[QuantumCoin] Buffered %d bits from quantum backend.", n)
+        return packed, n
+
+    def _pack_counts_stdlib(self, counts):
+        """
+        Without NumPy, draw outcomes i.i.d. at the measured frequencies with
+        random.choices (one C-level call) and pack the joined bitstring via
+        int(..., 2).to_bytes, matching the NumPy buffer layout.
+        """
+        n = sum(counts.values())
+        draws = random.choices(list(counts), weights=list(counts.values()), k=n)
+        bit_str = "".join(draws)
+        bit_str += "0" * (-len(bit_str) % 8)
+        packed = int(bit_str, 2).to_bytes(len(bit_str) // 8, "big")
+        logger.debug("[QuantumCoin] Buffered %d bits from quantum backend.", n)
+        return packed, n
+
+    def _alloc_scratch(self, n_samples: int):
+        """(Re)allocate the producer's sample and bit scratch arrays for n_samples outcomes."""
+        n_bytes = (n_samples * self._buffer_width + 7) >> 3
+        self._samples = np.empty(n_samples, dtype=np.uint8)
+        self._bits = np.empty(n_bytes * 8, dtype=np.uint8)
+
+    def _take_pool_buffer(self, n_bytes: int):
+        """Reuse a retired packed buffer from the pool, allocating only if none fits."""
+        try:
+            buf = self._pool.popleft()
+        except IndexError:
+            buf = None
+        if buf is None or len(buf) < n_bytes:
+            buf = np.empty(n_bytes, dtype=np.uint8)
+        return buf
+
+    def _producer_loop(self):
+        """
+        Background worker: one long-lived thread that turns each refill
+        request on `_refill_sem` into a ready buffer, so the latency of the
+        next job is hidden behind consumption of the current one. The
+        semaphore starts with `prefetch_depth` requests and gets one more
+        each time the consumer retires a buffer, which bounds the queue.
+
+        Hardware jobs are submitted without waiting on them; the worker keeps
+        their handles and polls them every HARDWARE_POLL_INTERVAL seconds, so
+        several jobs can sit in the IBM queue at once. A job that fails or
+        outlives `hardware_timeout` is cancelled and replaced by an Aer run.
+        After a failed refill the worker waits until the consumer runs dry
+        and signals `_retry` before trying again.
+        """
+        in_flight = []
+        pending = 0
+        stalled = False
+        while not self._closed:
+            polling = bool(in_flight) or (pending and stalled)
+            if self._refill_sem.acquire(timeout=HARDWARE_POLL_INTERVAL if polling else None):
+                pending += 1
+            if self._closed:
+                break
+
+            try:
+                in_flight, unfilled = self._reap_in_flight(in_flight)
+                if unfilled:
+                    pending += unfilled
+                    stalled = True
+                if stalled and self._retry.is_set():
+                    stalled = False
+
+                while pending and not stalled and not self._closed:
+                    if self._hardware_ready():
+                        try:
+                            job = self._submit_hardware()
+                            in_flight.append((job, time.monotonic() + self.hardware_timeout))
+                            pending -= 1
+                            continue
+                        except Exception as exc:
+                            logger.warning("[QuantumCoin] Hardware submit failed, trying Aer: %s", exc)
+                            self._start_hardware_cooldown()
+                    self._retry.clear()
+                    buf = self._produce_aer_buffer()
+                    if buf is None:
+                        stalled = True
+                        break
+                    self._publish(buf)
+                    pending -= 1
+            except Exception:
+                # Keep the worker alive; flip() falls back to classical bits
+                # until the consumer runs dry and signals `_retry`.
+                logger.exception("[QuantumCoin] Producer error; waiting for the next retry.")
+                stalled = True
+
+        for job, _ in in_flight:
+            self._cancel_hardware(job)
+
+    def _reap_in_flight(self, in_flight):
+        """
+        Publish buffers for finished hardware jobs, replacing failed or
+        timed-out ones with Aer runs. Returns (jobs still running, number of
+        refills that could not be filled).
+        """
+        still_running = []
+        unfilled = 0
+        now = time.monotonic()
+        for job, deadline in in_flight:
+            try:
+                done = job.done()
+            except Exception as exc:
+                logger.warning("[QuantumCoin] Hardware job status check failed, trying Aer: %s", exc)
+                self._cancel_hardware(job)
+                self._start_hardware_cooldown()
+            else:
+                if done:
+                    try:
+                        self._publish(self._buffer_from_counts(self._reap_hardware(job)))
+                        continue
+                    except Exception as exc:
+                        logger.warning("[QuantumCoin] Hardware sampling failed, trying Aer: %s", exc)
+                        self._start_hardware_cooldown()
+                elif now > deadline:
+                    logger.warning("[QuantumCoin] Hardware job %s timed out, trying Aer.", job.job_id())
+                    self._cancel_hardware(job)
+                    self._start_hardware_cooldown()
+                else:
+                    still_running.append((job, deadline))
+                    continue
+
+            buf = self._produce_aer_buffer()
+            if buf is None:
+                unfilled += 1
             else:
-                self._refill_buffer()
+                self._publish(buf)
+        return still_running, unfilled
 
-    def _refill_buffer(self):
+    def _publish(self, buf):
+        """Hand a finished buffer to the consumer; deque.append is atomic under the GIL."""
+        self._ready.append(buf)
+
+    def _request_refill(self):
+        """Ask the producer thread for one more buffer."""
+        self._refill_sem.release()
+
+    def _advance_buffer(self) -> bool:
         """
-        Run one quantum job with `self.shots` measurements, turn the
-        measurement counts into a shuffled list of bits, and store in
-        self._buffer.
+        Make the oldest ready buffer the active one; False if none is ready.
+        The producer only ever appends to `_ready`, and the active buffer and
+        its index belong to the consumer alone, so the atomic popleft is the
+        only hand-off point and no lock is needed.
         """
-        if self._fetching:
-            return
-        self._fetching = True
+        drained = self._buffer
         try:
-            if QuantumCircuit is None or transpile is None:
-                print("[QuantumCoin] _refill_buffer: missing Qiskit components.")
-                self._buffer = []
-                self._buffer_index = 0
-                return
-        # Right Here Casper!!
-            qc = self._build_circuit()
-
-            print("[QuantumCoin] Original circuit:")
-            print(qc)
-
-            target_backend = self.backend if (self.use_hardware and self.sampler is not None) else None
-            qc_t = transpile(qc, target_backend) if target_backend is not None else qc
-
-            counts = None
-
-            if self.use_hardware and self.sampler is not None:
-                try:
-                    counts = self._run_hardware_counts(qc_t)
-                except Exception as exc:
-                    print(f"[QuantumCoin] Hardware sampling failed, trying Aer: {exc}")
-
-            if counts is None and self.use_aer and self.aer_backend is not None:
-                qc_aer = transpile(qc, self.aer_backend)
-                try:
-                    counts = self._run_aer_counts(qc_aer)
-                except Exception as exc:
-                    print(f"[QuantumCoin] Aer sampling failed, falling back to classical: {exc}")
-
-            if counts is None:
-                self._buffer = []
-                self._buffer_index = 0
-                print("[QuantumCoin] _refill_buffer: no quantum counts available, using classical fallback.")
-                return
-
-            if self.save_histogram and plot_histogram is not None:
-                fig = plot_histogram(counts)
-                fig.savefig("Q-histogram.png")
-                plt.close(fig)
-                print("[QuantumCoin] Saved histogram to Q-histogram.png")
-
-            bit_list = []
-            for bit_str, cnt in counts.items():
-                bit_list.extend([bit_str] * cnt)
-
-            random.shuffle(bit_list)
-
-            self._buffer = bit_list
-            self._buffer_index = 0
-            print(f"[QuantumCoin] Buffered {len(self._buffer)} bits from quantum backend.")
-        finally:
-            self._fetching = False
+            self._buffer, self._buffer_len = self._ready.popleft()
+        except IndexError:
+            return False
+        if np is not None and len(drained):
+            self._pool.append(drained)
+        self._buffer_index = 0
+        self._request_refill()
+        return True
 
-    def _maybe_refill_async(self):
-        if self._fetching:
-            return
-        t = threading.Thread(target=self._refill_buffer, daemon=True)
-        t.start()
+    def close(self):
+        """Stop the producer thread; buffered bits stay usable."""
+        self._closed = True
+        self._refill_sem.release()
+        self._retry.set()
 
     def _build_circuit(self):
         """
-        Build the quantum circuit used for sampling. Chaos mode uses a
-        two-qubit entangling circuit with random single-qubit rotations to
-        introduce extra interference while still collapsing to a single bit
-        via parity.
+        Pick the module-level sampling circuit for this coin. Chaos mode uses
+        the entangling circuit whose rotation angles are bound per job.
         """
-        if QuantumCircuit is None:
+        if _BASE_CIRCUIT is None:
             raise RuntimeError("Qiskit QuantumCircuit not available")
 
         if self.chaos_mode:
-            qc = QuantumCircuit(2)
-            qc.h(0)
-            qc.cx(0, 1)
-            qc.ry(random.uniform(0, 2 * 3.141592653589793), 0)
-            qc.rz(random.uniform(0, 2 * 3.141592653589793), 1)
-            qc.h([0, 1])
-            qc.measure_all()
-            print("[QuantumCoin] Chaos mode circuit enabled.")
-        else:
-            qc = QuantumCircuit(1)
-            qc.h(0)
-            qc.measure_all()
-
-        return qc
-
-    def _run_hardware_counts(self, qc_t):
-        """Submit to IBM hardware and return counts; may raise on timeout."""
-        print(f"[QuantumCoin] Submitting hardware job with {self.shots} shots...")
-        job = self.sampler.run([qc_t], shots=self.shots)
-        print(f"[QuantumCoin] Submitted job ID: {job.job_id()}")
+            logger.info("[QuantumCoin] Chaos mode circuit enabled.")
+            return _CHAOS_CIRCUIT
+        return _BASE_CIRCUIT
+
+    def _hardware_circuit(self):
+        """
+        Return the circuit transpiled for the hardware backend. On first use,
+        load it from the on-disk QPY cache if an earlier run already
+        transpiled the same circuit for the same backend; otherwise transpile
+        `n_transpile_passes` times with different seeds, keep the result with
+        the fewest two-qubit gates plus depth, and cache the winner.
+        """
+        if self._qc_t_hw is None:
+            with self._transpile_lock:
+                if self._qc_t_hw is None:
+                    cache_path = self._transpile_cache_path()
+                    cached = self._load_transpile_cache(cache_path)
+                    if cached is not None:
+                        self._qc_t_hw = cached
+                        return cached
+
+                    best, best_cost = None, None
+                    for seed in range(self.n_transpile_passes):
+                        qc_t = transpile(
+                            self._circuit,
+                            self.backend,
+                            optimization_level=3,
+                            seed_transpiler=seed,
+                        )
+                        cost = self._circuit_cost(qc_t)
+                        if best_cost is None or cost < best_cost:
+                            best, best_cost = qc_t, cost
+                    logger.debug("[QuantumCoin] Best hardware transpile cost: %d", best_cost)
+                    self._store_transpile_cache(cache_path, best)
+                    self._qc_t_hw = best
+        return self._qc_t_hw
+
+    def _transpile_cache_path(self) -> Optional[str]:
+        """
+        Path of the QPY cache entry for the hardware transpile, keyed by a hash
+        of the circuit, the backend identity and basis, the transpile
+        settings, and the Qiskit version. None if QPY is unavailable.
+        """
+        if qpy is None:
+            return None
+        circuit_desc = [
+            (inst.operation.name, [self._circuit.find_bit(q).index for q in inst.qubits],
+             [str(p) for p in inst.operation.params])
+            for inst in self._circuit.data
+        ]
+        key_parts = (
+            repr(circuit_desc),
+            str(getattr(self.backend, "name", "")),
+            str(getattr(self.backend, "backend_version", "")),
+            repr(sorted(getattr(self.backend, "operation_names", []))),
+            str(self.n_transpile_passes),
+            str(qiskit_version),
+        )
+        key = hashlib.sha256("|".join(key_parts).encode()).hexdigest()
+        return os.path.join(self.transpile_cache_dir, f"{key}.qpy")
+
+    @staticmethod
+    def _load_transpile_cache(path: Optional[str]):
+        """Load a cached transpiled circuit, or None on a miss or unreadable file."""
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as fh:
+                qc_t = qpy.load(fh)[0]
+            logger.debug("[QuantumCoin] Loaded transpiled circuit from %s", path)
+            return qc_t
+        except Exception as exc:
+            logger.warning("[QuantumCoin] Ignoring unreadable transpile cache %s: %s", path, exc)
+            return None
+
+    @staticmethod
+    def _store_transpile_cache(path: Optional[str], qc_t):
+        """Write a transpiled circuit to the QPY cache; failures only cost the next startup."""
+        if path is None:
+            return
         try:
-            result = job.result(timeout=self.hardware_timeout)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as fh:
+                qpy.dump(qc_t, fh)
+            os.replace(tmp_path, path)
+            logger.debug("[QuantumCoin] Cached transpiled circuit at %s", path)
+        except Exception as exc:
+            logger.warning("[QuantumCoin] Could not write transpile cache %s: %s", path, exc)
+
+    @staticmethod
+    def _circuit_cost(qc_t) -> int:
+        """Two-qubit gate count plus depth; lower is shorter and less noisy on hardware."""
+        two_qubit = sum(1 for inst in qc_t.data if inst.operation.num_qubits == 2)
+        return two_qubit + qc_t.depth()
+
+    def _aer_circuit(self):
+        """
+        Return the circuit to run on Aer. Aer executes h/cx/ry/rz and
+        measurement natively, so when every gate is in the simulator's
+        operation set the circuit is used as-is; otherwise it is transpiled
+        once on first use.
+        """
+        if self._qc_t_aer is None:
+            with self._transpile_lock:
+                if self._qc_t_aer is None:
+                    supported = set(getattr(self.aer_backend, "operation_names", ())) | {"barrier"}
+                    if set(self._circuit.count_ops()) <= supported:
+                        self._qc_t_aer = self._circuit
+                    else:
+                        self._qc_t_aer = transpile(self._circuit, self.aer_backend, optimization_level=1)
+        return self._qc_t_aer
+
+    @staticmethod
+    def _bind_circuit(qc_t):
+        """
+        Assign fresh random chaos angles to a cached circuit; plain circuits
+        pass through. Binds by the circuit's own parameters so circuits
+        loaded from the transpile cache work too.
+        """
+        params = qc_t.parameters
+        if not params:
+            return qc_t
+        return qc_t.assign_parameters(
+            [random.uniform(0, 2 * 3.141592653589793) for _ in params]
+        )
+
+    def _submit_hardware(self):
+        """
+        Submit `hardware_batch` copies of the cached hardware circuit to IBM
+        as one job and return the job handle without waiting for it.
+        """
+        qc_t = self._hardware_circuit()
+        pubs = [self._bind_circuit(qc_t) for _ in range(self.hardware_batch)]
+        logger.debug("[QuantumCoin] Submitting hardware job with %d x %d shots...", len(pubs), self.shots)
+        job = self.sampler.run(pubs, shots=self.shots)
+        logger.debug("[QuantumCoin] Submitted job ID: %s", job.job_id())
+        return job
+
+    def _reap_hardware(self, job, timeout=None):
+        """
+        Return the merged counts of all circuits in a hardware job, so one
+        queue wait yields hardware_batch * shots outcomes; may raise on
+        timeout.
+        """
+        try:
+            result = job.result(timeout=timeout)
         except TypeError:
             raise RuntimeError("Hardware result() does not accept timeout; forcing fallback.")
-        counts = result[0].data.meas.get_counts()
-        print(f"[QuantumCoin] Raw hardware counts: {counts}")
+        counts = {}
+        for pub_result in result:
+            for bit_str, cnt in pub_result.data.meas.get_counts().items():
+                counts[bit_str] = counts.get(bit_str, 0) + cnt
+        logger.debug("[QuantumCoin] Raw hardware counts: %s", counts)
         return counts
 
+    @staticmethod
+    def _cancel_hardware(job):
+        """Best-effort cancel of a hardware job we no longer want."""
+        try:
+            job.cancel()
+        except Exception:
+            pass
+
     def _run_aer_counts(self, qc_t):
         """Run the circuit on Aer and return counts."""
-        print(f"[QuantumCoin] Running Aer simulation with {self.shots} shots...")
+        logger.debug("[QuantumCoin] Running Aer simulation with %d shots...", self.shots)
         job = self.aer_backend.run(qc_t, shots=self.shots)
         result = job.result()
         counts = result.get_counts()
-        print(f"[QuantumCoin] Aer counts: {counts}")
+        logger.debug("[QuantumCoin] Aer counts: %s", counts)
         return counts
 
-    def _next_bit(self) -> str:
-        """Fetch next raw bitstring from buffer, refilling as needed; fallback is classical."""
-        if self._buffer_index >= len(self._buffer):
-            self._maybe_refill_async()
-
-        if self._buffer_index >= len(self._buffer):
-            bit = str(random.randint(0, 1))
-            print(f"[QuantumCoin] Buffer empty, fallback classical bit: {bit}")
-            return bit
-
-        bit = self._buffer[self._buffer_index]
+    def _next_bit(self) -> Tuple[int, int]:
+        """
+        Fetch next measured outcome from buffer as (value, width), moving on
+        to the next prefetched buffer when the active one drains; fallback
+        is a single classical bit.
+        """
+        if self._buffer_index >= self._buffer_len and not self._advance_buffer():
+            self._retry.set()
+            if self._fallback_count == 0:
+                self._fallback_bits = random.getrandbits(64)
+                self._fallback_count = 64
+            bit = self._fallback_bits & 1
+            self._fallback_bits >>= 1
+            self._fallback_count -= 1
+            logger.debug("[QuantumCoin] Buffer empty, fallback classical bit: %d", bit)
+            return bit, 1
+
+        width = self._buffer_width
+        pos = self._buffer_index * width
+        value = 0
+        for _ in range(width):
+            byte = int(self._buffer[pos >> 3])
+            value = (value << 1) | ((byte >> (7 - (pos & 7))) & 1)
+            pos += 1
         self._buffer_index += 1
-        remaining = len(self._buffer) - self._buffer_index
-        print(f"[QuantumCoin] Quantum buffered bit: {bit} (remaining {remaining})")
-        return bit
-
-    @staticmethod
-    def _primary_from_raw(bit_str: str) -> int:
-        if len(bit_str) == 1:
-            return int(bit_str)
-        return bit_str.count("1") % 2
+        if logger.isEnabledFor(logging.DEBUG):
+            remaining = self._buffer_len - self._buffer_index
+            logger.debug("[QuantumCoin] Quantum buffered bit: %d (remaining %d)", value, remaining)
+        return value, width
 
     def flip(self, return_bits: bool = False):
         """Return a single 0/1 coin flip; optionally include raw bitstring."""
-        raw = self._next_bit()
-        primary = self._primary_from_raw(raw)
+        value, width = self._next_bit()
+        primary = value.bit_count() & 1
         if return_bits:
-            return primary, raw
+            return primary, format(value, f"0{width}b")
         return primary
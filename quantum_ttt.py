@@ -7,28 +7,66 @@ Quantum Tic-Tac-Toe
 Implements Quantum Tic-Tac-Toe game mechanics and a Tkinter GUI.
 
 Usage (CLI):
-    python quantum_ttt.py [--force-aer] [--chaos]
+    python quantum_ttt.py [--force-aer] [--chaos] [--verbose]
 """
     
 
+import logging
 import random
-from dataclasses import dataclass
+from array import array
+from heapq import heappop, heappush
 from typing import List, Optional, Tuple, Dict, Set
 from quantum_coin import QuantumCoin
 
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import messagebox
 import sys
 
 
 
 UI_SCALE = 1.8
-@dataclass
+
+# Players are 0 ('X') and 1 ('O') internally; characters are for display only.
+_PLAYER_CHAR: Tuple[str, str] = ('X', 'O')
+_OTHER: Tuple[int, int] = (1, 0)
+# occupant_player value for a square with no classical mark.
+_EMPTY = 255
+
+# Winning lines as cell triples and as 9-bit masks over the board.
+_WIN_LINES: Tuple[Tuple[int, int, int], ...] = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6),
+)
+_WIN_LINE_MASKS: Tuple[int, ...] = tuple(sum(1 << c for c in line) for line in _WIN_LINES)
+
+
 class Move:
-    player: str
-    index: int
-    cells: Tuple[int, int]
-    collapsed_to: Optional[int] = None
+    """Read-only view of one move stored in the logic's per-move arrays."""
+
+    __slots__ = ("_logic", "_i")
+
+    def __init__(self, logic: "QuantumTicTacToeLogic", i: int):
+        self._logic = logic
+        self._i = i
+
+    @property
+    def player(self) -> int:
+        return self._logic.move_player[self._i]
+
+    @property
+    def index(self) -> int:
+        return self._logic.move_index[self._i]
+
+    @property
+    def cells(self) -> Tuple[int, int]:
+        return self._logic.move_cell_a[self._i], self._logic.move_cell_b[self._i]
+
+    @property
+    def collapsed_to(self) -> Optional[int]:
+        c = self._logic.move_collapsed[self._i]
+        return None if c < 0 else c
 
 
 class QuantumTicTacToeLogic:
@@ -38,152 +76,223 @@ class QuantumTicTacToeLogic:
         self.reset()
 
     def reset(self):
-        self.moves: List[Move] = []
-        self.collapsed_board: List[Optional[Tuple[str, int]]] = [None] * 9
+        # Moves live in parallel arrays indexed by move number; moves and
+        # collapse_moves hold indices into them.
+        self.move_player = bytearray()
+        self.move_index = array('B')
+        self.move_cell_a = array('B')
+        self.move_cell_b = array('B')
+        self.move_collapsed = array('b')
+        self.move_count: int = 0
+        self.moves: List[int] = []
+        # Classical marks: owning player (_EMPTY if none) and move index per square.
+        self.occupant_player = bytearray(b'\xff' * 9)
+        self.occupant_index = bytearray(9)
+        self.x_mask: int = 0
+        self.o_mask: int = 0
+        # Positions in collapse_moves of the moves touching each square, and
+        # squares whose classical mark changed since the last propagation.
+        self._cell_to_moves: List[List[int]] = [[] for _ in range(9)]
+        self._touched_cells: Set[int] = set()
+        # Squares whose rendering may have changed; the GUI drains this.
+        self.dirty_cells: Set[int] = set(range(9))
         self.special_marks: Dict[int, str] = {}
-        self.move_counter = {'X': 0, 'O': 0}
-        self.current_player: str = 'X'
+        self.move_counter: List[int] = [0, 0]
+        self.current_player: int = 0
         self.mode: str = 'PLAY'
-        self.collapse_chooser: Optional[str] = None
-        self.cycle_creator: Optional[str] = None
-        self.next_player_after_collapse: Optional[str] = None
-        self.collapse_moves: List[Move] = []
+        self.collapse_chooser: Optional[int] = None
+        self.cycle_creator: Optional[int] = None
+        self.next_player_after_collapse: Optional[int] = None
+        self.collapse_moves: List[int] = []
         self.collapse_index: int = 0
+        self._parent: List[int] = list(range(9))
+        self._rank: List[int] = [0] * 9
+        self._members: Dict[int, Set[int]] = {i: {i} for i in range(9)}
 
     @staticmethod
-    def other_player(p: str) -> str:
-        return 'O' if p == 'X' else 'X'
-
-    def build_adjacency(self, moves: List[Move]) -> Dict[int, Set[int]]:
-        """Build adjacency among squares touched by moves."""
-        adj: Dict[int, Set[int]] = {}
-        for m in moves:
-            a, b = m.cells
-            adj.setdefault(a, set()).add(b)
-            adj.setdefault(b, set()).add(a)
-        return adj
-    
-    def get_connected_component(self, adj: Dict[int, Set[int]], start_node: int) -> Set[int]:
-        """Return all squares in the connected component of start_node."""
-        component = set()
-        stack = [start_node]
-        while stack:
-            node = stack.pop()
-            if node not in component:
-                component.add(node)
-                for neighbor in adj.get(node, []):
-                    if neighbor not in component:
-                        stack.append(neighbor)
-        return component
-
-    def bfs_reachable(self, adj: Dict[int, Set[int]], start: int, target: int) -> bool:
-        """Check if target is reachable from start in the current graph."""
-        if start == target:
-            return True
-        from collections import deque
-
-        q = deque([start])
-        visited = {start}
-        while q:
-            u = q.popleft()
-            for v in adj.get(u, []):
-                if v == target:
-                    return True
-                if v not in visited:
-                    visited.add(v)
-                    q.append(v)
-        return False
-
-    def would_create_loop(self, new_cells: Tuple[int, int]) -> bool:
-        """Return True if adding new_cells would create a cycle."""
-        a, b = new_cells
-        adj = self.build_adjacency(self.moves)
-        return self.bfs_reachable(adj, a, b)
+    def other_player(p: int) -> int:
+        return _OTHER[p]
+
+    def move(self, i: int) -> Move:
+        """Return a view of move i for callers that want attribute access."""
+        return Move(self, i)
+
+    def _append_move(self, player: int, index: int, cell1: int, cell2: int) -> int:
+        """Store a new uncollapsed move and return its move number."""
+        self.move_player.append(player)
+        self.move_index.append(index)
+        self.move_cell_a.append(cell1)
+        self.move_cell_b.append(cell2)
+        self.move_collapsed.append(-1)
+        i = self.move_count
+        self.move_count += 1
+        return i
+
+    def set_classical(self, cell: int, player: int, index: int = 0):
+        """
+        Set the classical mark on cell, or clear it when player is _EMPTY,
+        keeping the player masks in sync.
+        """
+        bit = 1 << cell
+        self.x_mask &= ~bit
+        self.o_mask &= ~bit
+        if player == 0:
+            self.x_mask |= bit
+        elif player == 1:
+            self.o_mask |= bit
+        else:
+            index = 0
+        self.occupant_player[cell] = player
+        self.occupant_index[cell] = index
+        self._touched_cells.add(cell)
+        self.dirty_cells.add(cell)
+
+    def _collapse_move(self, i: int, cell: int):
+        """Collapse move i onto cell, making it classical."""
+        self.move_collapsed[i] = cell
+        self.dirty_cells.add(self.move_cell_a[i])
+        self.dirty_cells.add(self.move_cell_b[i])
+        self.set_classical(cell, self.move_player[i], self.move_index[i])
+
+    def _find(self, x: int) -> int:
+        """Return the root of x's component, compressing the path behind it."""
+        parent = self._parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def _union(self, ra: int, rb: int):
+        """Merge two component roots, hanging the shallower tree under the deeper one."""
+        rank = self._rank
+        if rank[ra] < rank[rb]:
+            ra, rb = rb, ra
+        self._parent[rb] = ra
+        if rank[ra] == rank[rb]:
+            rank[ra] += 1
+        self._members[ra] |= self._members.pop(rb)
 
     def add_special_mark(self, cell: int, symbol: str):
         """Place a one-off special Y marker that blocks moves."""
         if 0 <= cell < 9:
             self.special_marks[cell] = symbol
+            self.dirty_cells.add(cell)
 
     def add_spooky_move(self, cell1: int, cell2: int):
         """Add a spooky move and trigger collapse if a loop forms."""
         assert self.mode == 'PLAY'
         assert cell1 != cell2
-        loop = self.would_create_loop((cell1, cell2))
+        ra, rb = self._find(cell1), self._find(cell2)
+        loop = ra == rb
+        if not loop:
+            self._union(ra, rb)
         self.move_counter[self.current_player] += 1
         idx = self.move_counter[self.current_player]
-        mv = Move(self.current_player, idx, (cell1, cell2))
-        self.moves.append(mv)
+        mi = self._append_move(self.current_player, idx, cell1, cell2)
+        self.moves.append(mi)
+        self.dirty_cells.add(cell1)
+        self.dirty_cells.add(cell2)
 
         if loop:
             self.cycle_creator = self.current_player
-            self.collapse_chooser = self.other_player(self.current_player)
+            self.collapse_chooser = _OTHER[self.current_player]
             self.next_player_after_collapse = self.collapse_chooser
-            adj = self.build_adjacency(self.moves)
-            involved_squares = self.get_connected_component(adj, cell1)
+            involved_squares = self._members[ra]
             to_collapse = []
             to_keep = []
 
-            for m in self.moves:
-                if m.cells[0] in involved_squares:
-                    to_collapse.append(m)
+            cell_a = self.move_cell_a
+            for i in self.moves:
+                if cell_a[i] in involved_squares:
+                    to_collapse.append(i)
                 else:
-                    to_keep.append(m)
+                    to_keep.append(i)
 
             self.collapse_moves = to_collapse
             self.moves = to_keep
 
+            cell_to_moves = [[] for _ in range(9)]
+            for pos, i in enumerate(to_collapse):
+                cell_to_moves[cell_a[i]].append(pos)
+                cell_to_moves[self.move_cell_b[i]].append(pos)
+            self._cell_to_moves = cell_to_moves
+            # Chaos effects can leave classical marks under spooky moves, so
+            # the first propagation must also start from those squares.
+            self._touched_cells = {
+                c for c in involved_squares if self.occupant_player[c] != _EMPTY
+            }
+
+            # The whole component leaves the spooky graph, so its squares
+            # become singletons again; no other square points into it.
+            for sq in involved_squares:
+                self._parent[sq] = sq
+                self._rank[sq] = 0
+                self._members[sq] = {sq}
+
             self.mode = 'COLLAPSE'
-            self.collapse_index = 0
-            for i, m in enumerate(self.collapse_moves):
-                if m is mv:
-                    self.collapse_index = i
-                    break
+            self.collapse_index = self.collapse_moves.index(mi)
 
         else:
-            self.current_player = self.other_player(self.current_player)
+            self.current_player = _OTHER[self.current_player]
 
     def collapse_step(self, chosen_cell: int) -> bool:
         """
         Perform one collapse selection for the current move in collapse_moves.
         After each selection, automatically collapse any moves that now have only
-        one valid square left (forced moves), and advance collapse_index to the
-        next uncollapsed move.
+        one valid square left (forced moves), and advance collapse_index past
+        the chosen move. The loop-closing move is always last in collapse_moves,
+        so that ends the collapse phase.
         """
         assert self.mode == 'COLLAPSE'
         if self.collapse_index >= len(self.collapse_moves):
             return True
 
-        mv = self.collapse_moves[self.collapse_index]
+        mi = self.collapse_moves[self.collapse_index]
+        cell_a, cell_b = self.move_cell_a, self.move_cell_b
+        collapsed = self.move_collapsed
 
-        if chosen_cell not in mv.cells:
+        if chosen_cell != cell_a[mi] and chosen_cell != cell_b[mi]:
             return False
-        if self.collapsed_board[chosen_cell] is not None:
+        if self.occupant_player[chosen_cell] != _EMPTY:
             return False
 
-        mv.collapsed_to = chosen_cell
-        self.collapsed_board[chosen_cell] = (mv.player, mv.index)
-
-        changed = True
-        while changed:
-            changed = False
-            for m in self.collapse_moves:
-                if m.collapsed_to is None:
-                    free = [c for c in m.cells if self.collapsed_board[c] is None]
-                    if len(free) == 1:
-                        m.collapsed_to = free[0]
-                        self.collapsed_board[free[0]] = (m.player, m.index)
-                        changed = True
-
-        while (
-            self.collapse_index < len(self.collapse_moves)
-            and self.collapse_moves[self.collapse_index].collapsed_to is not None
-        ):
-            self.collapse_index += 1
+        self._collapse_move(mi, chosen_cell)
+        self.collapse_index += 1
+
+        # Only moves touching a square that changed can have become forced,
+        # so propagate from those squares instead of rescanning every move.
+        # Positions are visited in collapse_moves order, pass by pass, so a
+        # square two forced moves compete for (possible after chaos effects)
+        # goes to the same move a full rescan would give it to.
+        cell_to_moves = self._cell_to_moves
+        occupant = self.occupant_player
+        work = sorted({pos for c in self._touched_cells for pos in cell_to_moves[c]})
+        next_pass = []
+        while work:
+            pos = heappop(work)
+            i = self.collapse_moves[pos]
+            if collapsed[i] < 0:
+                a, b = cell_a[i], cell_b[i]
+                fa = occupant[a] == _EMPTY
+                fb = occupant[b] == _EMPTY
+                if fa ^ fb:  # exactly one square left
+                    c = a if fa else b
+                    self._collapse_move(i, c)
+                    for other in cell_to_moves[c]:
+                        if other > pos:
+                            heappush(work, other)
+                        elif other < pos:
+                            next_pass.append(other)
+            if not work and next_pass:
+                work = sorted(set(next_pass))
+                next_pass = []
+        self._touched_cells.clear()
 
         if self.collapse_index >= len(self.collapse_moves):
             self.mode = 'PLAY'
-            if self.next_player_after_collapse:
+            if self.next_player_after_collapse is not None:
                 self.current_player = self.next_player_after_collapse
 
         return True
@@ -193,52 +302,51 @@ class QuantumTicTacToeLogic:
 
     def check_winner(self):
         """
-        Check classical board for 3-in-a-row.
+        Check classical board for 3-in-a-row. Players are 0 (X) and 1 (O).
         Returns:
           - None                  : no winner yet
           - ('DRAW', None, sum)   : tie with equal smallest index sum
-          - ('X', line, sum)      : X uniquely wins
-          - ('O', line, sum)      : O uniquely wins
-          - ('X', line, sum, ('O', o_line, o_sum)) : both win, X wins tiebreak
-          - ('O', line, sum, ('X', x_line, x_sum)) : both win, O wins tiebreak
+          - (0, line, sum)        : X uniquely wins
+          - (1, line, sum)        : O uniquely wins
+          - (0, line, sum, (1, o_line, o_sum)) : both win, X wins tiebreak
+          - (1, line, sum, (0, x_line, x_sum)) : both win, O wins tiebreak
         """
-        lines = [
-            (0, 1, 2), (3, 4, 5), (6, 7, 8),
-            (0, 3, 6), (1, 4, 7), (2, 5, 8),
-            (0, 4, 8), (2, 4, 6),
+        # A side needs at least three marks to own a line; skip sparser sides.
+        sides = [
+            (side, pm) for side, pm in ((0, self.x_mask), (1, self.o_mask))
+            if pm.bit_count() >= 3
         ]
-        wins = {'X': [], 'O': []}
-
-        for a, b, c in lines:
-            ca = self.collapsed_board[a]
-            cb = self.collapsed_board[b]
-            cc = self.collapsed_board[c]
-            if ca and cb and cc:
-                pa, ia = ca
-                pb, ib = cb
-                pc, ic = cc
-                if pa == pb == pc:
-                    s = ia + ib + ic
-                    wins[pa].append(((a, b, c), s))
-
-        if not wins['X'] and not wins['O']:
+        if not sides:
             return None
 
-        if wins['X'] and not wins['O']:
-            line, s = min(wins['X'], key=lambda t: t[1])
-            return 'X', line, s
+        ci = self.occupant_index
+        wins = ([], [])
+
+        for side, pm in sides:
+            for mask, line in zip(_WIN_LINE_MASKS, _WIN_LINES):
+                if pm & mask == mask:
+                    a, b, c = line
+                    wins[side].append((line, ci[a] + ci[b] + ci[c]))
 
-        if wins['O'] and not wins['X']:
-            line, s = min(wins['O'], key=lambda t: t[1])
-            return 'O', line, s
+        x_wins, o_wins = wins
+        if not x_wins and not o_wins:
+            return None
 
-        x_line, x_sum = min(wins['X'], key=lambda t: t[1])
-        o_line, o_sum = min(wins['O'], key=lambda t: t[1])
+        if x_wins and not o_wins:
+            line, s = min(x_wins, key=lambda t: t[1])
+            return 0, line, s
+
+        if o_wins and not x_wins:
+            line, s = min(o_wins, key=lambda t: t[1])
+            return 1, line, s
+
+        x_line, x_sum = min(x_wins, key=lambda t: t[1])
+        o_line, o_sum = min(o_wins, key=lambda t: t[1])
 
         if x_sum < o_sum:
-            return 'X', x_line, x_sum, ('O', o_line, o_sum)
+            return 0, x_line, x_sum, (1, o_line, o_sum)
         elif o_sum < x_sum:
-            return 'O', o_line, o_sum, ('X', x_line, x_sum)
+            return 1, o_line, o_sum, (0, x_line, x_sum)
         else:
             return 'DRAW', None, x_sum
 
@@ -251,7 +359,14 @@ class QuantumTicTacToeGUI:
     - Spooky pairs are connected by colored lines on the canvas.
     """
 
-    def __init__(self, root: tk.Tk, scale: float = UI_SCALE, force_aer: bool = False, chaos_mode: bool = False):
+    def __init__(
+        self,
+        root: tk.Tk,
+        scale: float = UI_SCALE,
+        force_aer: bool = False,
+        chaos_mode: bool = False,
+        verbose: bool = False,
+    ):
         self.root = root
         self.root.title("Quantum Tic-Tac-Toe")
 
@@ -266,12 +381,13 @@ class QuantumTicTacToeGUI:
         self.quantum_coin = QuantumCoin(
             backend_name="ibm_torino",
             aer_backend_name="aer_simulator",
-            shots=256,
             force_aer=force_aer,
             chaos_mode=chaos_mode,
+            verbose=verbose,
         )
 
         self.status_var = tk.StringVar()
+        self._status_text: Optional[str] = None
         self.status_label = tk.Label(
             root,
             textvariable=self.status_var,
@@ -285,6 +401,9 @@ class QuantumTicTacToeGUI:
         self.canvas_size = int(300 * self.scale)
         self.cell_size = self.canvas_size // 3
         self.margin = int(4 * self.scale)
+        self._cell_centers: Tuple[Tuple[float, float], ...] = tuple(
+            self._compute_center(i) for i in range(9)
+        )
 
         self.board_canvas = tk.Canvas(
             root,
@@ -315,8 +434,9 @@ class QuantumTicTacToeGUI:
         self.mixed_fg = "#674ea7"
         self.special_fg = "#0a8f3c"
 
-        self.classical_font = ("Arial", int(12 * self.scale), "bold")
-        self.spooky_font = ("Arial", int(10 * self.scale))
+        # Named fonts are resolved by Tk once instead of on every itemconfig.
+        self.classical_font = tkfont.Font(family="Arial", size=int(12 * self.scale), weight="bold")
+        self.spooky_font = tkfont.Font(family="Arial", size=int(10 * self.scale))
 
         for idx in range(9):
             r, c = divmod(idx, 3)
@@ -342,6 +462,7 @@ class QuantumTicTacToeGUI:
                 text="",
                 font=self.spooky_font,
                 fill="black",
+                tags=("cell_text",),
             )
             self.cell_text_ids.append(text)
 
@@ -350,8 +471,19 @@ class QuantumTicTacToeGUI:
             w = max(1, int(2 * self.scale))
             self.board_canvas.create_line(x, 0, x, self.canvas_size, width=w)
             self.board_canvas.create_line(0, x, self.canvas_size, x, width=w)
-
-        self.line_ids: List[int] = []
+        self.board_canvas.tag_raise("cell_text")
+
+        # Spooky line canvas ids keyed by move number, plus what each cell
+        # last showed so update_board_display only touches what changed.
+        self.line_ids: Dict[int, int] = {}
+        self._last_cell_state: List[Optional[tuple]] = [None] * 9
+        # Squares of each spooky move on screen (kept so they can be removed
+        # after a reset) and the moves shown in each cell, in play order.
+        self._shown_cells: Dict[int, Tuple[int, int]] = {}
+        self._cell_moves: List[List[int]] = [[] for _ in range(9)]
+        self._dirty_cells: Set[int] = set(range(9))
+        self._rendered_mode: Optional[str] = None
+        self._rendered_temp_cell: Optional[int] = None
         self.highlight_color = "#000000"
         self.highlight_width = max(1, int(3 * self.scale))
 
@@ -376,6 +508,10 @@ class QuantumTicTacToeGUI:
 
     def cell_center(self, idx: int) -> Tuple[float, float]:
         """Return pixel center of cell index 0..8."""
+        return self._cell_centers[idx]
+
+    def _compute_center(self, idx: int) -> Tuple[float, float]:
+        """Compute the pixel center of a cell from the board geometry."""
         r, c = divmod(idx, 3)
         x0 = c * self.cell_size + self.margin
         y0 = r * self.cell_size + self.margin
@@ -389,65 +525,72 @@ class QuantumTicTacToeGUI:
         self.update_board_display()
         self.update_status()
 
+    def _set_status(self, text: str):
+        """Update the status line, skipping the Tk call when the text is unchanged."""
+        if text != self._status_text:
+            self._status_text = text
+            self.status_var.set(text)
+
     def update_status(self):
         if self.logic.mode == 'PLAY':
             if self.temp_first_cell is None:
-                self.status_var.set(
-                    f"{self.logic.current_player}'s turn: choose first square of spooky pair"
+                self._set_status(
+                    f"{_PLAYER_CHAR[self.logic.current_player]}'s turn: choose first square of spooky pair"
                 )
             else:
-                self.status_var.set(
-                    f"{self.logic.current_player}'s turn: choose second square (must be different)"
+                self._set_status(
+                    f"{_PLAYER_CHAR[self.logic.current_player]}'s turn: "
+                    "choose second square (must be different)"
                 )
         else:
             if self.logic.collapse_index < len(self.logic.collapse_moves):
-                mv = self.logic.collapse_moves[self.logic.collapse_index]
+                mv = self.logic.move(self.logic.collapse_moves[self.logic.collapse_index])
                 a, b = mv.cells
-                self.status_var.set(
-                    f"Collapse phase: Player {self.logic.collapse_chooser} chooses "
-                    f"collapse for {mv.player}{mv.index} (squares {a+1} and {b+1})"
+                self._set_status(
+                    f"Collapse phase: Player {_PLAYER_CHAR[self.logic.collapse_chooser]} chooses "
+                    f"collapse for {_PLAYER_CHAR[mv.player]}{mv.index} (squares {a+1} and {b+1})"
                 )
             else:
-                self.status_var.set("Collapse phase: finishing...")
+                self._set_status("Collapse phase: finishing...")
 
     def update_board_display(self):
-        """Re-render cell texts, colors, and spooky lines from Logic state."""
-        cell_texts = [[] for _ in range(9)]
-        players_in_cell = [set() for _ in range(9)]
-
-        for i in range(9):
-            cb = self.logic.collapsed_board[i]
-            if cb is not None:
-                p, idx = cb
-                cell_texts[i].append(f"{p}({idx})")
-                players_in_cell[i].add(p)
-
-            special = self.logic.special_marks.get(i)
+        """Re-render the cells whose state changed and sync the spooky lines."""
+        lg = self.logic
+        dirty = self._dirty_cells
+        dirty |= lg.dirty_cells
+        lg.dirty_cells.clear()
+        if lg.mode != self._rendered_mode:
+            # Leaving or entering a collapse changes which moves are shown.
+            dirty.update(range(9))
+            self._rendered_mode = lg.mode
+        if self.temp_first_cell != self._rendered_temp_cell:
+            for c in (self.temp_first_cell, self._rendered_temp_cell):
+                if c is not None:
+                    dirty.add(c)
+            self._rendered_temp_cell = self.temp_first_cell
+        if not dirty:
+            return
+
+        added, removed = self._sync_spooky_moves(dirty)
+        move_player, move_index = lg.move_player, lg.move_index
+
+        for i in dirty:
+            parts = []
+            owner = lg.occupant_player[i]
+            if owner != _EMPTY:
+                parts.append(f"{_PLAYER_CHAR[owner]}({lg.occupant_index[i]})")
+
+            special = lg.special_marks.get(i)
             if special:
-                cell_texts[i].append(f"{special}")
-
-        for m in self.logic.moves:
-            label = f"{m.player}{m.index}"
-            a, b = m.cells
-            cell_texts[a].append(label)
-            cell_texts[b].append(label)
-            players_in_cell[a].add(m.player)
-            players_in_cell[b].add(m.player)
-
-        if self.logic.mode == 'COLLAPSE':
-            for m in self.logic.collapse_moves:
-                if m.collapsed_to is None:
-                    label = f"{m.player}{m.index}"
-                    a, b = m.cells
-                    cell_texts[a].append(label)
-                    cell_texts[b].append(label)
-                    players_in_cell[a].add(m.player)
-                    players_in_cell[b].add(m.player)
-
-        for i in range(9):
-            label = "\n".join(cell_texts[i])
-            cb = self.logic.collapsed_board[i]
-            pset = players_in_cell[i]
+                parts.append(f"{special}")
+
+            # Bit p is set when player p has a spooky mark here.
+            pset = 0
+            for m in self._cell_moves[i]:
+                p = move_player[m]
+                parts.append(f"{_PLAYER_CHAR[p]}{move_index[m]}")
+                pset |= 1 << p
+            label = "\n".join(parts)
 
             bg = self.default_bg
             fg = "black"
@@ -455,11 +598,10 @@ class QuantumTicTacToeGUI:
             outline = ""
             outline_width = 0
 
-            special = self.logic.special_marks.get(i)
+            special = lg.special_marks.get(i)
 
-            if cb is not None:
-                p, _ = cb
-                if p == 'X':
+            if owner != _EMPTY:
+                if owner == 0:
                     bg = self.x_classical_bg
                     fg = self.x_fg
                 else:
@@ -471,61 +613,90 @@ class QuantumTicTacToeGUI:
                 fg = self.special_fg
                 font = self.classical_font
             else:
-                if "X" in pset and "O" not in pset:
+                if pset == 0b01:
                     fg = self.x_fg
-                elif "O" in pset and "X" not in pset:
+                elif pset == 0b10:
                     fg = self.o_fg
-                elif "X" in pset and "O" in pset:
+                elif pset == 0b11:
                     fg = self.mixed_fg
 
                 if (
-                    self.logic.mode == 'PLAY'
+                    lg.mode == 'PLAY'
                     and self.temp_first_cell is not None
                     and i == self.temp_first_cell
                 ):
                     outline = self.highlight_color
                     outline_width = self.highlight_width
 
-            self.board_canvas.itemconfig(
-                self.cell_rect_ids[i],
-                fill=bg,
-                outline=outline,
-                width=outline_width,
-            )
-            self.board_canvas.itemconfig(
-                self.cell_text_ids[i],
-                text=label,
-                fill=fg,
-                font=font,
-            )
+            rect_state = (bg, outline, outline_width)
+            text_state = (label, fg, font)
+            last = self._last_cell_state[i]
+            if last is None or last[0] != rect_state:
+                self.board_canvas.itemconfig(
+                    self.cell_rect_ids[i],
+                    fill=bg,
+                    outline=outline,
+                    width=outline_width,
+                )
+            if last is None or last[1] != text_state:
+                self.board_canvas.itemconfig(
+                    self.cell_text_ids[i],
+                    text=label,
+                    fill=fg,
+                    font=font,
+                )
+            self._last_cell_state[i] = (rect_state, text_state)
 
-        self.redraw_lines()
+        dirty.clear()
+        self.redraw_lines(added, removed)
 
-    def redraw_lines(self):
-        """Draw colored lines for all spooky pairs."""
-        for lid in self.line_ids:
-            self.board_canvas.delete(lid)
-        self.line_ids = []
+    def _visible_moves(self) -> List[int]:
+        """Return the move numbers currently drawn as spooky marks."""
+        lg = self.logic
+        visible = list(lg.moves)
+        if lg.mode == 'COLLAPSE':
+            visible.extend(i for i in lg.collapse_moves if lg.move_collapsed[i] < 0)
+        return visible
 
-        def add_line(a: int, b: int, player: str):
-            x1, y1 = self.cell_center(a)
-            x2, y2 = self.cell_center(b)
-            color = self.x_fg if player == 'X' else self.o_fg
-            w = max(1, int(2 * self.scale))
-            self.line_ids.append(
-                self.board_canvas.create_line(x1, y1, x2, y2, fill=color, width=w)
+    def _sync_spooky_moves(self, dirty: Set[int]) -> Tuple[List[int], List[int]]:
+        """
+        Bring the per-cell spooky move lists in line with the logic, marking
+        affected cells dirty. Returns the (added, removed) move numbers.
+        """
+        lg = self.logic
+        visible = self._visible_moves()
+        visible_set = set(visible)
+        shown = self._shown_cells
+        removed = [i for i in shown if i not in visible_set]
+        added = [i for i in visible if i not in shown]
+        for i in removed:
+            for c in shown.pop(i):
+                self._cell_moves[c].remove(i)
+                dirty.add(c)
+        for i in added:
+            cells = shown[i] = (lg.move_cell_a[i], lg.move_cell_b[i])
+            for c in cells:
+                self._cell_moves[c].append(i)
+                dirty.add(c)
+        return added, removed
+
+    def redraw_lines(self, added: List[int], removed: List[int]):
+        """Create lines for newly shown spooky pairs and delete lines for removed ones."""
+        lg = self.logic
+        for i in removed:
+            self.board_canvas.delete(self.line_ids.pop(i))
+
+        w = max(1, int(2 * self.scale))
+        for i in added:
+            x1, y1 = self.cell_center(lg.move_cell_a[i])
+            x2, y2 = self.cell_center(lg.move_cell_b[i])
+            color = (self.x_fg, self.o_fg)[lg.move_player[i]]
+            self.line_ids[i] = self.board_canvas.create_line(
+                x1, y1, x2, y2, fill=color, width=w, tags=("spooky",)
             )
 
-        for m in self.logic.moves:
-            add_line(m.cells[0], m.cells[1], m.player)
-
-        if self.logic.mode == 'COLLAPSE':
-            for m in self.logic.collapse_moves:
-                if m.collapsed_to is None:
-                    add_line(m.cells[0], m.cells[1], m.player)
-
-        for text_id in self.cell_text_ids:
-            self.board_canvas.tag_raise(text_id)
+        if added:
+            self.board_canvas.tag_lower("spooky", "cell_text")
 
     def on_canvas_click(self, event):
         """Map a mouse click on the canvas to a cell index and delegate."""
@@ -542,7 +713,7 @@ class QuantumTicTacToeGUI:
             self.handle_collapse_click(idx)
 
     def handle_play_click(self, idx: int):
-        if self.logic.collapsed_board[idx] is not None or self.logic.special_marks.get(idx):
+        if self.logic.occupant_player[idx] != _EMPTY or self.logic.special_marks.get(idx):
             messagebox.showinfo("Illegal move", "Occupied!")
             return
 
@@ -571,15 +742,15 @@ class QuantumTicTacToeGUI:
             if self.logic.mode == 'COLLAPSE':
                 messagebox.showinfo(
                     "Loop detected",
-                    f"Player {self.logic.cycle_creator} created a loop.\n"
-                    f"Player {self.logic.collapse_chooser} will choose how to collapse.",
+                    f"Player {_PLAYER_CHAR[self.logic.cycle_creator]} created a loop.\n"
+                    f"Player {_PLAYER_CHAR[self.logic.collapse_chooser]} will choose how to collapse.",
                 )
 
     def handle_collapse_click(self, idx: int):
         if self.logic.collapse_index >= len(self.logic.collapse_moves):
             return
 
-        mv = self.logic.collapse_moves[self.logic.collapse_index]
+        mv = self.logic.move(self.logic.collapse_moves[self.logic.collapse_index])
 
         if idx not in mv.cells:
             messagebox.showinfo(
@@ -588,7 +759,7 @@ class QuantumTicTacToeGUI:
             )
             return
 
-        if self.logic.collapsed_board[idx] is not None or self.logic.special_marks.get(idx):
+        if self.logic.occupant_player[idx] != _EMPTY or self.logic.special_marks.get(idx):
             messagebox.showinfo(
                 "Invalid choice",
                 "This square is blocked. Choose the other one."
@@ -617,7 +788,7 @@ class QuantumTicTacToeGUI:
                 f"Game over: draw (equal minimal index sum = {result[2]}).",
             )
         else:
-            winner = result[0]
+            winner = _PLAYER_CHAR[result[0]]
             if len(result) == 3:
                 _, line, s = result
                 messagebox.showinfo(
@@ -632,37 +803,40 @@ class QuantumTicTacToeGUI:
                     "Winner",
                     f"Both players formed three in a row.\n"
                     f"Player {winner} wins with smaller index sum {s} "
-                    f"vs {other}'s {o_s}.",
+                    f"vs {_PLAYER_CHAR[other]}'s {o_s}.",
                 )
 
     def _swap_random_classical_cells(self) -> str:
-        occupied = [i for i, v in enumerate(self.logic.collapsed_board) if v is not None]
+        lg = self.logic
+        occupied = [i for i, p in enumerate(lg.occupant_player) if p != _EMPTY]
         if len(occupied) < 2:
             return "Chaos 01: not enough collapsed cells to swap."
         a, b = random.sample(occupied, 2)
-        self.logic.collapsed_board[a], self.logic.collapsed_board[b] = (
-            self.logic.collapsed_board[b],
-            self.logic.collapsed_board[a],
-        )
+        va = lg.occupant_player[a], lg.occupant_index[a]
+        vb = lg.occupant_player[b], lg.occupant_index[b]
+        lg.set_classical(a, *vb)
+        lg.set_classical(b, *va)
         return f"Chaos 01: swapped classical cells {a+1} and {b+1}."
 
     def _rotate_random_row(self) -> str:
         row = random.randint(0, 2)
         start = row * 3
-        row_vals = self.logic.collapsed_board[start:start + 3]
+        lg = self.logic
+        row_vals = [(lg.occupant_player[c], lg.occupant_index[c]) for c in range(start, start + 3)]
         rotated = [row_vals[-1], row_vals[0], row_vals[1]]
-        self.logic.collapsed_board[start:start + 3] = rotated
+        for offset, val in enumerate(rotated):
+            lg.set_classical(start + offset, *val)
         return f"Chaos 10: rotated row {row+1} (shifted right)."
 
     def _flip_random_classical_cell(self) -> str:
-        occupied = [i for i, v in enumerate(self.logic.collapsed_board) if v is not None]
+        lg = self.logic
+        occupied = [i for i, p in enumerate(lg.occupant_player) if p != _EMPTY]
         if not occupied:
             return "Chaos 11: no classical cells to flip."
         idx = random.choice(occupied)
-        player, move_idx = self.logic.collapsed_board[idx]
-        other = self.logic.other_player(player)
-        self.logic.collapsed_board[idx] = (other, move_idx)
-        return f"Chaos 11: flipped cell {idx+1} to player {other}."
+        other = lg.other_player(lg.occupant_player[idx])
+        lg.set_classical(idx, other, lg.occupant_index[idx])
+        return f"Chaos 11: flipped cell {idx+1} to player {_PLAYER_CHAR[other]}."
 
     def _apply_chaos_effect(self, raw_bits: str) -> Optional[str]:
         if not self.chaos_mode:
@@ -694,7 +868,7 @@ class QuantumTicTacToeGUI:
 
         symbol = "Y" if (val % 2) == 0 else "W"
 
-        empties = [i for i, v in enumerate(self.logic.collapsed_board) if v is None]
+        empties = [i for i, p in enumerate(self.logic.occupant_player) if p == _EMPTY]
         target_pool = empties if empties else list(range(9))
         cell = target_pool[val % len(target_pool)]
 
@@ -716,14 +890,9 @@ class QuantumTicTacToeGUI:
         if self.logic.collapse_index >= len(self.logic.collapse_moves):
             return
 
-        mv = self.logic.collapse_moves[self.logic.collapse_index]
+        mv = self.logic.move(self.logic.collapse_moves[self.logic.collapse_index])
         a, b = mv.cells
 
-        self.status_var.set(
-            f"Quantum collapse: contacting IBM backend for {mv.player}{mv.index}..."
-        )
-        self.root.update_idletasks()
-
         try:
             bit, raw_bits = self.quantum_coin.flip(return_bits=True)
         except Exception as e:
@@ -736,9 +905,9 @@ class QuantumTicTacToeGUI:
             return
 
         chosen_cell = a if bit == 0 else b
-        if self.logic.collapsed_board[chosen_cell] is not None:
+        if self.logic.occupant_player[chosen_cell] != _EMPTY:
             other = b if chosen_cell == a else a
-            if self.logic.collapsed_board[other] is not None:
+            if self.logic.occupant_player[other] != _EMPTY:
                 messagebox.showinfo(
                     "Already collapsed",
                     "Both squares for this move are already occupied."
@@ -748,11 +917,10 @@ class QuantumTicTacToeGUI:
             chosen_cell = other
 
         which = "first" if chosen_cell == a else "second"
-        self.status_var.set(
+        self._set_status(
             f"Quantum collapse result: measured {raw_bits} -> {bit}, "
-            f"{mv.player}{mv.index} -> {which} square (cell {chosen_cell+1})."
+            f"{_PLAYER_CHAR[mv.player]}{mv.index} -> {which} square (cell {chosen_cell+1})."
         )
-        self.root.update_idletasks()
 
         accepted = self.logic.collapse_step(chosen_cell)
         if not accepted:
@@ -765,9 +933,9 @@ class QuantumTicTacToeGUI:
 
         self.update_board_display()
         if chaos_msg:
-            self.status_var.set(chaos_msg)
+            self._set_status(chaos_msg)
         elif gift_msg:
-            self.status_var.set(gift_msg)
+            self._set_status(gift_msg)
         else:
             self.update_status()
 
@@ -819,8 +987,15 @@ if __name__ == "__main__":
         action="store_true",
         help="Use an entangling chaos circuit for randomness",
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log every quantum job and buffered bit",
+    )
     args = parser.parse_args()
 
+    logging.basicConfig(format="%(message)s")
+
     root = tk.Tk()
 
     root.update_idletasks()
@@ -833,6 +1008,7 @@ if __name__ == "__main__":
         scale=auto_scale,
         force_aer=args.force_aer,
         chaos_mode=args.chaos,
+        verbose=args.verbose,
     )
 
     root.protocol("WM_DELETE_WINDOW", app.on_close)